@@ -0,0 +1 @@
+"""USDC balance, send and CCTP bridge helpers."""
@@ -0,0 +1,288 @@
+"""
+Shared USDC constants and RPC helpers
+Used by balance.py, send.py and bridge.py.
+"""
+
+import argparse
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+# web3/requests are imported lazily so --help and error paths start fast
+if TYPE_CHECKING:
+    import requests
+    from web3 import Web3
+
+# USDC Contract Addresses (EIP-55 checksummed, so used as-is)
+USDC_ADDRESSES = {
+    "ethereum": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
+    "ethereum_sepolia": "0x1c7D4B196Cb0C7B01d743Fbc6116a902379C7238",
+    "base": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
+    "base_sepolia": "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
+    "polygon": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
+    "polygon_mumbai": "0x9999f7Fea5938fD3b1E26A12c3f2fb024e194f97",
+    "arbitrum": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
+    "arbitrum_sepolia": "0x75faf114eafb1BDbe2F0316DF893fd58CE46AA4d",
+}
+
+# USDC decimals (6 on every supported chain; avoids a decimals() RPC)
+USDC_DECIMALS = {
+    "ethereum": 6,
+    "ethereum_sepolia": 6,
+    "base": 6,
+    "base_sepolia": 6,
+    "polygon": 6,
+    "polygon_mumbai": 6,
+    "arbitrum": 6,
+    "arbitrum_sepolia": 6,
+}
+
+# Base units per whole USDC, precomputed from USDC_DECIMALS
+USDC_SCALE = {chain: 10 ** decimals for chain, decimals in USDC_DECIMALS.items()}
+
+# Default RPC endpoints (public, rate-limited)
+DEFAULT_RPCS = {
+    "ethereum": "https://eth.llamarpc.com",
+    "ethereum_sepolia": "https://ethereum-sepolia-rpc.publicnode.com",
+    "base": "https://base.llamarpc.com",
+    "base_sepolia": "https://base-sepolia-rpc.publicnode.com",
+    "polygon": "https://polygon.llamarpc.com",
+    "polygon_mumbai": "https://polygon-mumbai-bor-rpc.publicnode.com",
+    "arbitrum": "https://arbitrum.llamarpc.com",
+    "arbitrum_sepolia": "https://arbitrum-sepolia-rpc.publicnode.com",
+}
+
+# Multicall3 (same address on every supported chain)
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Fallback gas limits, used when no estimate is available for a chain
+GAS_LIMITS = {
+    "transfer": 100000,
+    "approve": 100000,
+    "depositForBurn": 300000,
+    "receiveMessage": 300000,
+}
+
+# Highest padded gas estimate/usage seen per (chain, function)
+_GAS_BASELINE = {}
+
+# USDC ABI (minimal: balanceOf, decimals, transfer, approve, allowance)
+USDC_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "type": "function",
+    },
+    {
+        "constant": False,
+        "inputs": [
+            {"name": "_to", "type": "address"},
+            {"name": "_value", "type": "uint256"}
+        ],
+        "name": "transfer",
+        "outputs": [{"name": "", "type": "bool"}],
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "spender", "type": "address"},
+            {"name": "amount", "type": "uint256"}
+        ],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "owner", "type": "address"},
+            {"name": "spender", "type": "address"}
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+
+def get_chain_key(chain: str, testnet: bool) -> str:
+    """Get the chain key for addresses/RPCs."""
+    if testnet:
+        testnet_map = {
+            "ethereum": "ethereum_sepolia",
+            "base": "base_sepolia",
+            "polygon": "polygon_mumbai",
+            "arbitrum": "arbitrum_sepolia",
+        }
+        return testnet_map.get(chain, chain)
+    return chain
+
+
+@lru_cache(maxsize=None)
+def _get_session() -> "requests.Session":
+    """Shared HTTP session so RPC calls reuse pooled keep-alive connections."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+@lru_cache(maxsize=16)
+def _get_w3(rpc_url: str) -> "Web3":
+    """Web3 instance for an RPC URL, built once and reused."""
+    from web3 import Web3
+    return Web3(Web3.HTTPProvider(rpc_url, session=_get_session()))
+
+
+@lru_cache(maxsize=64)
+def _get_usdc_contract(rpc_url: str, address: str):
+    """USDC contract bound to an RPC URL, built once and reused."""
+    return _get_w3(rpc_url).eth.contract(
+        address=address,
+        abi=USDC_ABI
+    )
+
+
+@lru_cache(maxsize=16)
+def _get_multicall_contract(rpc_url: str):
+    """Multicall3 contract bound to an RPC URL, built once and reused."""
+    return _get_w3(rpc_url).eth.contract(
+        address=MULTICALL3,
+        abi=MULTICALL3_ABI
+    )
+
+
+def multicall(rpc_url: str, calls: list) -> list:
+    """Run (target, calldata) reads as a single Multicall3 eth_call.
+
+    Returns each call's raw return data, or None where the call reverted.
+    """
+    results = _get_multicall_contract(rpc_url).functions.aggregate3(
+        [(target, True, data) for target, data in calls]
+    ).call()
+    return [data if success else None for success, data in results]
+
+
+def batch_call(w3: "Web3", *calls) -> list:
+    """Run RPC calls (zero-arg callables) as one JSON-RPC batch.
+
+    Falls back to serial calls only if the endpoint rejects the batch itself
+    (a 4xx HTTP status other than 429, a non-list response or a -32600
+    Invalid Request error); per-call errors are raised.
+    """
+    import requests
+    from web3.exceptions import BadResponseFormat, Web3RPCError
+    
+    try:
+        with w3.batch_requests() as batch:
+            for call in calls:
+                batch.add(call())
+            return batch.execute()
+    except requests.exceptions.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        # 429 is rate limiting, not a rejected batch; serial calls won't help
+        if status is None or not 400 <= status < 500 or status == 429:
+            raise
+    except BadResponseFormat:
+        pass
+    except Web3RPCError as e:
+        error = (getattr(e, "rpc_response", None) or {}).get("error")
+        if not isinstance(error, dict) or error.get("code") != -32600:
+            raise
+    return [call() for call in calls]
+
+
+def to_base_units(amount, scale: int) -> int:
+    """Convert a USDC amount to base units, rejecting values that would truncate."""
+    try:
+        units = Decimal(str(amount)) * scale
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount {amount!r}: not a number") from None
+    if not units.is_finite() or units <= 0 or units % 1:
+        raise ValueError(
+            f"Invalid amount {amount}: must be positive with at most "
+            f"{len(str(scale)) - 1} decimal places"
+        )
+    return int(units)
+
+
+def _amount(value: str) -> Decimal:
+    """argparse type for --amount: a usage error instead of a Decimal traceback."""
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"invalid amount: {value!r}") from None
+    if not amount.is_finite() or amount <= 0:
+        raise argparse.ArgumentTypeError(f"amount must be positive: {value!r}")
+    return amount
+
+
+def fee_params(w3: "Web3", fee_history: dict) -> dict:
+    """EIP-1559 fee fields from an eth_feeHistory result (legacy gasPrice fallback)."""
+    base_fees = fee_history.get("baseFeePerGas") or []
+    if not base_fees or not base_fees[-1]:
+        return {"gasPrice": w3.eth.gas_price}
+    tip = max((reward[0] for reward in fee_history.get("reward") or []), default=0)
+    return {"maxFeePerGas": 2 * base_fees[-1] + tip, "maxPriorityFeePerGas": tip}
+
+
+def gas_limit(chain_key: str, fn_name: str, estimate: int = None) -> int:
+    """Pad a gas estimate by 20%, or fall back to the chain's gas baseline.
+
+    Estimates only ever raise the baseline, so one cheap call can't under-gas
+    a later one that has to rely on it.
+    """
+    key = (chain_key, fn_name)
+    if estimate is None:
+        return _GAS_BASELINE.get(key, GAS_LIMITS[fn_name])
+    padded = int(estimate * 1.2)
+    _GAS_BASELINE[key] = max(_GAS_BASELINE.get(key, 0), padded)
+    return padded
+
+
+def record_gas_used(chain_key: str, fn_name: str, gas_used: int) -> None:
+    """Raise the chain's gas baseline to cover a mined tx's padded gasUsed."""
+    key = (chain_key, fn_name)
+    _GAS_BASELINE[key] = max(_GAS_BASELINE.get(key, GAS_LIMITS[fn_name]), int(gas_used * 1.2))
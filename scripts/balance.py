@@ -1,71 +1,36 @@
 #!/usr/bin/env python3
 """
 USDC Balance Checker
-Check USDC balance on any supported chain.
+Check USDC balance on any supported chain, or all of them at once.
 """
 
 import argparse
 import os
-from web3 import Web3
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
-# USDC Contract Addresses
-USDC_ADDRESSES = {
-    "ethereum": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
-    "ethereum_sepolia": "0x1c7D4B196Cb0C7B01d743Fbc6116a902379C7238",
-    "base": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
-    "base_sepolia": "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
-    "polygon": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
-    "polygon_mumbai": "0x9999f7Fea5938fD3b1E26A12c3f2fb024e194f97",
-    "arbitrum": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
-    "arbitrum_sepolia": "0x75faf114eafb1BDbe2F0316DF893fd58CE46AA4d",
-}
+if not __package__:  # run directly as a script: import via the scripts package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
+from ._common import (
+    USDC_ADDRESSES,
+    USDC_DECIMALS,
+    USDC_SCALE,
+    DEFAULT_RPCS,
+    get_chain_key,
+    _get_usdc_contract,
+    multicall,
+)
 
-# Default RPC endpoints (public, rate-limited)
-DEFAULT_RPCS = {
-    "ethereum": "https://eth.llamarpc.com",
-    "ethereum_sepolia": "https://ethereum-sepolia-rpc.publicnode.com",
-    "base": "https://base.llamarpc.com",
-    "base_sepolia": "https://base-sepolia-rpc.publicnode.com",
-    "polygon": "https://polygon.llamarpc.com",
-    "polygon_mumbai": "https://polygon-mumbai-bor-rpc.publicnode.com",
-    "arbitrum": "https://arbitrum.llamarpc.com",
-    "arbitrum_sepolia": "https://arbitrum-sepolia-rpc.publicnode.com",
-}
+CHAINS = ["ethereum", "base", "polygon", "arbitrum"]
 
-# ERC20 ABI (minimal for balanceOf)
-ERC20_ABI = [
-    {
-        "constant": True,
-        "inputs": [{"name": "_owner", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"name": "balance", "type": "uint256"}],
-        "type": "function",
-    },
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "type": "function",
-    },
-]
 
-
-def get_chain_key(chain: str, testnet: bool) -> str:
-    """Get the chain key for addresses/RPCs."""
-    if testnet:
-        testnet_map = {
-            "ethereum": "ethereum_sepolia",
-            "base": "base_sepolia",
-            "polygon": "polygon_mumbai",
-            "arbitrum": "arbitrum_sepolia",
-        }
-        return testnet_map.get(chain, chain)
-    return chain
-
-
-def get_balance(address: str, chain: str, testnet: bool = False) -> dict:
+def get_balance(address: str, chain: str, testnet: bool = False,
+                verify_decimals: bool = False) -> dict:
     """Get USDC balance for an address on a specific chain."""
+    import requests
+    from web3 import Web3
+    
     chain_key = get_chain_key(chain, testnet)
     
     # Get RPC URL from env or use default
@@ -80,22 +45,26 @@ def get_balance(address: str, chain: str, testnet: bool = False) -> dict:
         return {"error": f"USDC not supported on chain: {chain_key}"}
     
     try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
-        if not w3.is_connected():
-            return {"error": f"Could not connect to {chain_key} RPC"}
+        contract = _get_usdc_contract(rpc_url, usdc_address)
+        decimals = USDC_DECIMALS.get(chain_key)
+        scale = USDC_SCALE.get(chain_key)
         
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(usdc_address),
-            abi=ERC20_ABI
-        )
+        # All reads for this chain go out as one Multicall3 eth_call
+        calls = [(usdc_address, contract.encode_abi(
+            "balanceOf", args=[Web3.to_checksum_address(address)]
+        ))]
+        if verify_decimals or decimals is None:
+            calls.append((usdc_address, contract.encode_abi("decimals")))
+        results = multicall(rpc_url, calls)
+        if None in results:
+            return {"error": f"USDC call reverted on chain: {chain_key}"}
         
-        balance_raw = contract.functions.balanceOf(
-            Web3.to_checksum_address(address)
-        ).call()
-        
-        decimals = contract.functions.decimals().call()
-        balance = balance_raw / (10 ** decimals)
+        codec = contract.w3.codec
+        balance_raw = codec.decode(["uint256"], results[0])[0]
+        if len(results) > 1:
+            decimals = codec.decode(["uint8"], results[1])[0]
+            scale = 10 ** decimals
+        balance = balance_raw / scale
         
         return {
             "address": address,
@@ -107,24 +76,55 @@ def get_balance(address: str, chain: str, testnet: bool = False) -> dict:
             "usdc_contract": usdc_address,
         }
         
+    except (requests.exceptions.ConnectionError, requests.exceptions.HTTPError):
+        return {"error": f"Could not connect to {chain_key} RPC"}
     except Exception as e:
         return {"error": str(e)}
 
 
+def get_balances(address: str, chains: list = None, testnet: bool = False,
+                 verify_decimals: bool = False) -> list:
+    """Get USDC balances for an address on several chains in parallel."""
+    chains = chains or CHAINS
+    with ThreadPoolExecutor(max_workers=len(chains)) as pool:
+        return list(pool.map(
+            lambda chain: get_balance(address, chain, testnet, verify_decimals),
+            chains,
+        ))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Check USDC balance")
     parser.add_argument("--address", "-a", required=True, help="Wallet address")
     parser.add_argument("--chain", "-c", default="base", 
-                        choices=["ethereum", "base", "polygon", "arbitrum"],
-                        help="Blockchain network")
+                        choices=CHAINS + ["all"],
+                        help="Blockchain network, or 'all' for every chain")
     parser.add_argument("--testnet", "-t", action="store_true",
                         help="Use testnet")
     parser.add_argument("--json", "-j", action="store_true",
                         help="Output as JSON")
+    parser.add_argument("--verify-decimals", action="store_true",
+                        help="Read decimals() on-chain instead of the built-in value")
     
     args = parser.parse_args()
     
-    result = get_balance(args.address, args.chain, args.testnet)
+    if args.chain == "all":
+        results = get_balances(args.address, CHAINS, args.testnet, args.verify_decimals)
+        
+        if args.json:
+            import json
+            print(json.dumps(results, indent=2))
+        else:
+            print(f"💰 USDC Balances ({'testnet' if args.testnet else 'mainnet'})")
+            print(f"   Address: {args.address}")
+            for chain, result in zip(CHAINS, results):
+                if "error" in result:
+                    print(f"   {chain}: ❌ {result['error']}")
+                else:
+                    print(f"   {result['chain']}: {result['balance']:.6f} USDC")
+        return
+    
+    result = get_balance(args.address, args.chain, args.testnet, args.verify_decimals)
     
     if args.json:
         import json
@@ -4,7 +4,7 @@ USDC Bridge Script (CCTP)
 Bridge USDC across blockchains using Circle's Cross-Chain Transfer Protocol.
 
 Flow:
-1. Approve USDC spend to TokenMessenger
+1. Approve USDC spend to TokenMessenger (skipped if the allowance already covers it)
 2. Burn USDC on source chain via depositForBurn
 3. Wait for Circle attestation
 4. Mint USDC on destination chain via receiveMessage
@@ -12,12 +12,35 @@ Flow:
 
 import argparse
 import os
+import sys
+from decimal import Decimal
+import random
 import time
-import requests
-from web3 import Web3
-from eth_account import Account
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-# CCTP Contract Addresses
+if not __package__:  # run directly as a script: import via the scripts package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
+from ._common import (
+    USDC_ADDRESSES,
+    USDC_SCALE,
+    DEFAULT_RPCS,
+    get_chain_key,
+    _get_w3,
+    _get_usdc_contract,
+    batch_call,
+    fee_params,
+    gas_limit,
+    to_base_units,
+    _amount,
+    record_gas_used,
+)
+
+if TYPE_CHECKING:
+    import requests
+
+# CCTP Contract Addresses (all addresses below are EIP-55 checksummed, so used as-is)
 # TokenMessenger - handles deposits/burns
 TOKEN_MESSENGER = {
     "ethereum": "0xBd3fa81B58Ba92a82136038B25aDec7066af3155",
@@ -53,54 +76,21 @@ DOMAIN_IDS = {
     "polygon": 7,
 }
 
-# USDC addresses
-USDC_ADDRESSES = {
-    "ethereum": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
-    "ethereum_sepolia": "0x1c7D4B196Cb0C7B01d743Fbc6116a902379C7238",
-    "base": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
-    "base_sepolia": "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
-    "polygon": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
-    "arbitrum": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
-    "arbitrum_sepolia": "0x75faf114eafb1BDbe2F0316DF893fd58CE46AA4d",
-}
-
-DEFAULT_RPCS = {
-    "ethereum": "https://eth.llamarpc.com",
-    "ethereum_sepolia": "https://ethereum-sepolia-rpc.publicnode.com",
-    "base": "https://base.llamarpc.com",
-    "base_sepolia": "https://base-sepolia-rpc.publicnode.com",
-    "polygon": "https://polygon.llamarpc.com",
-    "arbitrum": "https://arbitrum.llamarpc.com",
-    "arbitrum_sepolia": "https://arbitrum-sepolia-rpc.publicnode.com",
-}
-
 # Circle Attestation API
 ATTESTATION_API = {
     "mainnet": "https://iris-api.circle.com/attestations",
     "testnet": "https://iris-api-sandbox.circle.com/attestations",
 }
 
-# ABIs
-ERC20_APPROVE_ABI = [
-    {
-        "inputs": [
-            {"name": "spender", "type": "address"},
-            {"name": "amount", "type": "uint256"}
-        ],
-        "name": "approve",
-        "outputs": [{"name": "", "type": "bool"}],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    },
-    {
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "stateMutability": "view",
-        "type": "function",
-    },
-]
+# Attestation polling backoff (seconds): min(cap, base * 2**attempt) + jitter
+ATTESTATION_BACKOFF_BASE = 1.0
+ATTESTATION_BACKOFF_CAP = 30.0
+ATTESTATION_BACKOFF_JITTER = 0.5
 
+# (connect, read) timeouts for each attestation request, in seconds
+ATTESTATION_TIMEOUT = (5, 30)
+
+# ABIs
 TOKEN_MESSENGER_ABI = [
     {
         "inputs": [
@@ -127,23 +117,57 @@ MESSAGE_TRANSMITTER_ABI = [
         "stateMutability": "nonpayable",
         "type": "function",
     },
+    {
+        "anonymous": False,
+        "inputs": [{"indexed": False, "name": "message", "type": "bytes"}],
+        "name": "MessageSent",
+        "type": "event",
+    },
 ]
 
 
-def get_chain_key(chain: str, testnet: bool) -> str:
-    if testnet:
-        testnet_map = {
-            "ethereum": "ethereum_sepolia",
-            "base": "base_sepolia",
-            "arbitrum": "arbitrum_sepolia",
-        }
-        return testnet_map.get(chain, chain)
-    return chain
+@lru_cache(maxsize=None)
+def _get_attestation_session() -> "requests.Session":
+    """Keep-alive session for the attestation API, retrying 429/5xx responses.
+
+    Kept apart from the RPC session so unreachable RPCs fail fast. Retry-After
+    is left to get_attestation(), which caps it at ATTESTATION_BACKOFF_CAP.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        max_retries=Retry(total=5, backoff_factor=1, raise_on_status=False,
+                          status_forcelist=[429, 500, 502, 503, 504],
+                          respect_retry_after_header=False),
+    ))
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+@lru_cache(maxsize=64)
+def _get_messenger_contract(rpc_url: str, address: str):
+    """TokenMessenger contract bound to an RPC URL, built once and reused."""
+    return _get_w3(rpc_url).eth.contract(
+        address=address,
+        abi=TOKEN_MESSENGER_ABI
+    )
+
+
+@lru_cache(maxsize=64)
+def _get_transmitter_contract(rpc_url: str, address: str):
+    """MessageTransmitter contract bound to an RPC URL, built once and reused."""
+    return _get_w3(rpc_url).eth.contract(
+        address=address,
+        abi=MESSAGE_TRANSMITTER_ABI
+    )
 
 
 def address_to_bytes32(address: str) -> bytes:
     """Convert address to bytes32 (padded)."""
-    return bytes.fromhex(address[2:].zfill(64))
+    return int(address, 16).to_bytes(32, "big")
 
 
 def get_attestation(message_hash: str, testnet: bool = True, max_attempts: int = 30) -> dict:
@@ -151,30 +175,48 @@ def get_attestation(message_hash: str, testnet: bool = True, max_attempts: int =
     api_url = ATTESTATION_API["testnet" if testnet else "mainnet"]
     
     for attempt in range(max_attempts):
+        delay = min(ATTESTATION_BACKOFF_CAP, ATTESTATION_BACKOFF_BASE * 2 ** attempt)
+        delay += random.uniform(0, ATTESTATION_BACKOFF_JITTER)
+        
         try:
-            response = requests.get(f"{api_url}/{message_hash}")
-            data = response.json()
+            response = _get_attestation_session().get(f"{api_url}/{message_hash}",
+                                                      timeout=ATTESTATION_TIMEOUT)
             
-            if data.get("status") == "complete":
-                return {
-                    "success": True,
-                    "attestation": data.get("attestation"),
-                    "message": data.get("message"),
-                }
+            # Let the API pace us when it says how long to wait
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = min(float(retry_after), ATTESTATION_BACKOFF_CAP)
             
-            print(f"   Waiting for attestation... ({attempt + 1}/{max_attempts})")
-            time.sleep(10)
+            if response.status_code == 429 or response.status_code >= 500:
+                print(f"   Attestation API busy (HTTP {response.status_code}), retrying...")
+            else:
+                data = response.json()
+                
+                if data.get("status") == "complete":
+                    return {
+                        "success": True,
+                        "attestation": data.get("attestation"),
+                        "message": data.get("message"),
+                    }
+                
+                print(f"   Waiting for attestation... ({attempt + 1}/{max_attempts})")
             
         except Exception as e:
             print(f"   Attestation API error: {e}")
-            time.sleep(5)
+        
+        if attempt + 1 < max_attempts:
+            time.sleep(delay)
     
     return {"error": "Attestation timeout"}
 
 
-def bridge_usdc(to: str, amount: float, from_chain: str, to_chain: str, 
-                testnet: bool = True, private_key: str = None) -> dict:
+def bridge_usdc(to: str, amount: Decimal, from_chain: str, to_chain: str, 
+                testnet: bool = True, private_key: str = None,
+                verify_decimals: bool = False) -> dict:
     """Bridge USDC from one chain to another using CCTP."""
+    from web3 import Web3
+    from web3.logs import DISCARD
+    from eth_account import Account
     
     from_key = get_chain_key(from_chain, testnet)
     to_key = get_chain_key(to_chain, testnet)
@@ -188,79 +230,119 @@ def bridge_usdc(to: str, amount: float, from_chain: str, to_chain: str,
     to_rpc = os.getenv(f"USDC_RPC_{to_chain.upper()}", DEFAULT_RPCS.get(to_key))
     
     try:
+        to = Web3.to_checksum_address(to)
+        
         # Connect to source chain
-        w3_from = Web3(Web3.HTTPProvider(from_rpc))
+        w3_from = _get_w3(from_rpc)
         account = Account.from_key(pk)
         sender = account.address
         
         # Get contract addresses
         usdc_addr = USDC_ADDRESSES.get(from_key)
         messenger_addr = TOKEN_MESSENGER.get(from_key)
+        src_transmitter_addr = MESSAGE_TRANSMITTER.get(from_key)
+        dest_transmitter_addr = MESSAGE_TRANSMITTER.get(to_key)
         dest_domain = DOMAIN_IDS.get(to_key)
         
-        if not all([usdc_addr, messenger_addr, dest_domain is not None]):
+        if not all([usdc_addr, messenger_addr, src_transmitter_addr,
+                    dest_transmitter_addr, dest_domain is not None]):
             return {"error": f"CCTP not supported for {from_key} -> {to_key}"}
         
         # Setup contracts
-        usdc = w3_from.eth.contract(
-            address=Web3.to_checksum_address(usdc_addr),
-            abi=ERC20_APPROVE_ABI
+        usdc = _get_usdc_contract(from_rpc, usdc_addr)
+        messenger = _get_messenger_contract(from_rpc, messenger_addr)
+        
+        scale = USDC_SCALE.get(from_key)
+        if verify_decimals or scale is None:
+            scale = 10 ** usdc.functions.decimals().call()
+        amount_raw = to_base_units(amount, scale)
+        
+        approve_fn = usdc.functions.approve(
+            messenger_addr,
+            amount_raw
         )
-        messenger = w3_from.eth.contract(
-            address=Web3.to_checksum_address(messenger_addr),
-            abi=TOKEN_MESSENGER_ABI
+        burn_fn = messenger.functions.depositForBurn(
+            amount_raw,
+            dest_domain,
+            address_to_bytes32(to),
+            usdc_addr
         )
+        chain_id, fee_history, nonce, allowance, approve_gas = batch_call(
+            w3_from,
+            lambda: w3_from.eth.chain_id,
+            lambda: w3_from.eth.fee_history(5, "latest", [50]),
+            lambda: w3_from.eth.get_transaction_count(sender, "pending"),
+            lambda: usdc.functions.allowance(sender, messenger_addr).call(),
+            lambda: approve_fn.estimate_gas({'from': sender}),
+        )
+        fees = fee_params(w3_from, fee_history)
+        needs_approve = allowance < amount_raw
         
-        decimals = usdc.functions.decimals().call()
-        amount_raw = int(amount * (10 ** decimals))
+        # Sign approve (nonce N) and burn (nonce N+1) up front and submit them
+        # back-to-back; nonce ordering guarantees the approve is mined first.
+        # The burn can't be estimated before the allowance exists, so it uses
+        # the gas baseline for this chain unless no approve is needed.
+        burn_gas = None
+        if not needs_approve:
+            burn_gas = burn_fn.estimate_gas({'from': sender})
+        if needs_approve:
+            approve_tx = approve_fn.build_transaction({
+                'from': sender,
+                'nonce': nonce,
+                'gas': gas_limit(from_key, "approve", approve_gas),
+                'chainId': chain_id,
+                **fees,
+            })
+            signed_approve = w3_from.eth.account.sign_transaction(approve_tx, pk)
+        burn_tx = burn_fn.build_transaction({
+            'from': sender,
+            'nonce': nonce + 1 if needs_approve else nonce,
+            'gas': gas_limit(from_key, "depositForBurn", burn_gas),
+            'chainId': chain_id,
+            **fees,
+        })
+        signed_burn = w3_from.eth.account.sign_transaction(burn_tx, pk)
         
         # Step 1: Approve TokenMessenger to spend USDC
         print(f"Step 1/4: Approving USDC spend...")
-        nonce = w3_from.eth.get_transaction_count(sender)
-        approve_tx = usdc.functions.approve(
-            Web3.to_checksum_address(messenger_addr),
-            amount_raw
-        ).build_transaction({
-            'from': sender,
-            'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': w3_from.eth.gas_price,
-            'chainId': w3_from.eth.chain_id,
-        })
-        signed = w3_from.eth.account.sign_transaction(approve_tx, pk)
-        tx_hash = w3_from.eth.send_raw_transaction(signed.raw_transaction)
-        w3_from.eth.wait_for_transaction_receipt(tx_hash)
-        print(f"   Approved: {tx_hash.hex()}")
+        approve_hash = None
+        if needs_approve:
+            approve_hash = w3_from.eth.send_raw_transaction(signed_approve.raw_transaction)
+            print(f"   Approve sent: {approve_hash.hex()}")
+        else:
+            print(f"   Existing allowance covers the amount, skipping approve")
+        approve_tx_hex = approve_hash.hex() if approve_hash else None
         
         # Step 2: Deposit for burn
         print(f"Step 2/4: Burning USDC on {from_key}...")
-        recipient_bytes32 = address_to_bytes32(to)
-        nonce = w3_from.eth.get_transaction_count(sender)
-        
-        burn_tx = messenger.functions.depositForBurn(
-            amount_raw,
-            dest_domain,
-            recipient_bytes32,
-            Web3.to_checksum_address(usdc_addr)
-        ).build_transaction({
-            'from': sender,
-            'nonce': nonce,
-            'gas': 300000,
-            'gasPrice': w3_from.eth.gas_price,
-            'chainId': w3_from.eth.chain_id,
-        })
-        signed = w3_from.eth.account.sign_transaction(burn_tx, pk)
-        burn_hash = w3_from.eth.send_raw_transaction(signed.raw_transaction)
+        try:
+            burn_hash = w3_from.eth.send_raw_transaction(signed_burn.raw_transaction)
+        except Exception as e:
+            return {"error": f"Burn submission failed: {e}", "approve_tx": approve_tx_hex}
         receipt = w3_from.eth.wait_for_transaction_receipt(burn_hash)
+        if receipt["status"] != 1:
+            failed = "Burn"
+            if approve_hash and w3_from.eth.wait_for_transaction_receipt(approve_hash)["status"] != 1:
+                failed = "Approve"
+            return {
+                "error": f"{failed} transaction reverted",
+                "approve_tx": approve_tx_hex,
+                "burn_tx": burn_hash.hex(),
+            }
+        record_gas_used(from_key, "depositForBurn", receipt["gasUsed"])
         print(f"   Burned: {burn_hash.hex()}")
         
-        # Step 3: Get message hash from logs and fetch attestation
+        # Step 3: Get message hash from the MessageSent log and fetch attestation
         print(f"Step 3/4: Waiting for Circle attestation...")
-        # Note: In production, you'd parse the MessageSent event to get the message hash
-        # For now, we'll use a simplified approach
-        message_hash = f"0x{burn_hash.hex()}"  # Simplified - should parse from logs
+        src_transmitter = _get_transmitter_contract(from_rpc, src_transmitter_addr)
+        logs = src_transmitter.events.MessageSent().process_receipt(receipt, errors=DISCARD)
+        if not logs:
+            return {"error": "No MessageSent event in burn receipt", "burn_tx": burn_hash.hex()}
+        message = logs[0]["args"]["message"]
+        message_hash = Web3.to_hex(Web3.keccak(message))
         
         attestation_result = get_attestation(message_hash, testnet)
+        
         if "error" in attestation_result:
             return {
                 "partial_success": True,
@@ -271,22 +353,28 @@ def bridge_usdc(to: str, amount: float, from_chain: str, to_chain: str,
         
         # Step 4: Receive on destination chain
         print(f"Step 4/4: Minting USDC on {to_key}...")
-        w3_to = Web3(Web3.HTTPProvider(to_rpc))
-        transmitter = w3_to.eth.contract(
-            address=Web3.to_checksum_address(MESSAGE_TRANSMITTER.get(to_key)),
-            abi=MESSAGE_TRANSMITTER_ABI
-        )
+        w3_to = _get_w3(to_rpc)
+        transmitter = _get_transmitter_contract(to_rpc, dest_transmitter_addr)
         
-        nonce = w3_to.eth.get_transaction_count(sender)
-        receive_tx = transmitter.functions.receiveMessage(
-            bytes.fromhex(attestation_result["message"][2:]),
+        receive_fn = transmitter.functions.receiveMessage(
+            message,
             bytes.fromhex(attestation_result["attestation"][2:])
-        ).build_transaction({
+        )
+        # Read destination tx params only now: fees and nonce fetched while
+        # the attestation was pending would be stale by submit time
+        chain_id, fee_history, nonce, receive_gas = batch_call(
+            w3_to,
+            lambda: w3_to.eth.chain_id,
+            lambda: w3_to.eth.fee_history(5, "latest", [50]),
+            lambda: w3_to.eth.get_transaction_count(sender, "pending"),
+            lambda: receive_fn.estimate_gas({'from': sender}),
+        )
+        receive_tx = receive_fn.build_transaction({
             'from': sender,
             'nonce': nonce,
-            'gas': 300000,
-            'gasPrice': w3_to.eth.gas_price,
-            'chainId': w3_to.eth.chain_id,
+            'gas': gas_limit(to_key, "receiveMessage", receive_gas),
+            'chainId': chain_id,
+            **fee_params(w3_to, fee_history),
         })
         signed = w3_to.eth.account.sign_transaction(receive_tx, pk)
         receive_hash = w3_to.eth.send_raw_transaction(signed.raw_transaction)
@@ -294,7 +382,7 @@ def bridge_usdc(to: str, amount: float, from_chain: str, to_chain: str,
         
         return {
             "success": True,
-            "amount": amount,
+            "amount": float(amount),
             "from_chain": from_key,
             "to_chain": to_key,
             "recipient": to,
@@ -309,7 +397,7 @@ def bridge_usdc(to: str, amount: float, from_chain: str, to_chain: str,
 def main():
     parser = argparse.ArgumentParser(description="Bridge USDC across chains via CCTP")
     parser.add_argument("--to", "-t", required=True, help="Recipient address")
-    parser.add_argument("--amount", "-a", required=True, type=float, help="Amount in USDC")
+    parser.add_argument("--amount", "-a", required=True, type=_amount, help="Amount in USDC")
     parser.add_argument("--from-chain", "-f", required=True,
                         choices=["ethereum", "base", "polygon", "arbitrum"],
                         help="Source chain")
@@ -322,6 +410,8 @@ def main():
                         help="Use mainnet (DANGER!)")
     parser.add_argument("--json", "-j", action="store_true",
                         help="Output as JSON")
+    parser.add_argument("--verify-decimals", action="store_true",
+                        help="Read decimals() on-chain instead of the built-in value")
     
     args = parser.parse_args()
     
@@ -338,7 +428,8 @@ def main():
     print(f"   Network: {'testnet' if use_testnet else 'MAINNET'}")
     print()
     
-    result = bridge_usdc(args.to, args.amount, args.from_chain, args.to_chain, use_testnet)
+    result = bridge_usdc(args.to, args.amount, args.from_chain, args.to_chain, use_testnet,
+                         verify_decimals=args.verify_decimals)
     
     if args.json:
         import json
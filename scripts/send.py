@@ -6,69 +6,33 @@ Send USDC on the same chain.
 
 import argparse
 import os
-from web3 import Web3
-from eth_account import Account
+import sys
+from decimal import Decimal
 
-# USDC Contract Addresses (same as balance.py)
-USDC_ADDRESSES = {
-    "ethereum": "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",
-    "ethereum_sepolia": "0x1c7D4B196Cb0C7B01d743Fbc6116a902379C7238",
-    "base": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913",
-    "base_sepolia": "0x036CbD53842c5426634e7929541eC2318f3dCF7e",
-    "polygon": "0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359",
-    "polygon_mumbai": "0x9999f7Fea5938fD3b1E26A12c3f2fb024e194f97",
-    "arbitrum": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831",
-    "arbitrum_sepolia": "0x75faf114eafb1BDbe2F0316DF893fd58CE46AA4d",
-}
+if not __package__:  # run directly as a script: import via the scripts package
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = "scripts"
+from ._common import (
+    USDC_ADDRESSES,
+    USDC_SCALE,
+    DEFAULT_RPCS,
+    get_chain_key,
+    _get_w3,
+    _get_usdc_contract,
+    batch_call,
+    fee_params,
+    gas_limit,
+    to_base_units,
+    _amount,
+)
 
-DEFAULT_RPCS = {
-    "ethereum": "https://eth.llamarpc.com",
-    "ethereum_sepolia": "https://ethereum-sepolia-rpc.publicnode.com",
-    "base": "https://base.llamarpc.com",
-    "base_sepolia": "https://base-sepolia-rpc.publicnode.com",
-    "polygon": "https://polygon.llamarpc.com",
-    "polygon_mumbai": "https://polygon-mumbai-bor-rpc.publicnode.com",
-    "arbitrum": "https://arbitrum.llamarpc.com",
-    "arbitrum_sepolia": "https://arbitrum-sepolia-rpc.publicnode.com",
-}
 
-# ERC20 ABI for transfer
-ERC20_ABI = [
-    {
-        "constant": False,
-        "inputs": [
-            {"name": "_to", "type": "address"},
-            {"name": "_value", "type": "uint256"}
-        ],
-        "name": "transfer",
-        "outputs": [{"name": "", "type": "bool"}],
-        "type": "function",
-    },
-    {
-        "constant": True,
-        "inputs": [],
-        "name": "decimals",
-        "outputs": [{"name": "", "type": "uint8"}],
-        "type": "function",
-    },
-]
-
-
-def get_chain_key(chain: str, testnet: bool) -> str:
-    if testnet:
-        testnet_map = {
-            "ethereum": "ethereum_sepolia",
-            "base": "base_sepolia",
-            "polygon": "polygon_mumbai",
-            "arbitrum": "arbitrum_sepolia",
-        }
-        return testnet_map.get(chain, chain)
-    return chain
-
-
-def send_usdc(to: str, amount: float, chain: str, testnet: bool = True, 
-              private_key: str = None) -> dict:
+def send_usdc(to: str, amount: Decimal, chain: str, testnet: bool = True, 
+              private_key: str = None, verify_decimals: bool = False) -> dict:
     """Send USDC to an address on the same chain."""
+    import requests
+    from web3 import Web3
+    from eth_account import Account
     
     chain_key = get_chain_key(chain, testnet)
     
@@ -89,37 +53,40 @@ def send_usdc(to: str, amount: float, chain: str, testnet: bool = True,
         return {"error": f"USDC not supported on chain: {chain_key}"}
     
     try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
-        if not w3.is_connected():
-            return {"error": f"Could not connect to {chain_key} RPC"}
+        w3 = _get_w3(rpc_url)
         
         # Get account from private key
         account = Account.from_key(pk)
         sender = account.address
         
         # Setup contract
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(usdc_address),
-            abi=ERC20_ABI
-        )
+        contract = _get_usdc_contract(rpc_url, usdc_address)
         
-        # Get decimals and calculate amount
-        decimals = contract.functions.decimals().call()
-        amount_raw = int(amount * (10 ** decimals))
+        scale = USDC_SCALE.get(chain_key)
+        if verify_decimals or scale is None:
+            scale = 10 ** contract.functions.decimals().call()
+        amount_raw = to_base_units(amount, scale)
         
-        # Build transaction
-        nonce = w3.eth.get_transaction_count(sender)
-        
-        tx = contract.functions.transfer(
+        # Fetch tx params and gas estimate in a single round-trip
+        transfer_fn = contract.functions.transfer(
             Web3.to_checksum_address(to),
             amount_raw
-        ).build_transaction({
+        )
+        nonce, fee_history, chain_id, transfer_gas = batch_call(
+            w3,
+            lambda: w3.eth.get_transaction_count(sender, "pending"),
+            lambda: w3.eth.fee_history(5, "latest", [50]),
+            lambda: w3.eth.chain_id,
+            lambda: transfer_fn.estimate_gas({'from': sender}),
+        )
+        
+        # Build transaction
+        tx = transfer_fn.build_transaction({
             'from': sender,
             'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': w3.eth.gas_price,
-            'chainId': w3.eth.chain_id,
+            'gas': gas_limit(chain_key, "transfer", transfer_gas),
+            'chainId': chain_id,
+            **fee_params(w3, fee_history),
         })
         
         # Sign and send
@@ -131,12 +98,14 @@ def send_usdc(to: str, amount: float, chain: str, testnet: bool = True,
             "tx_hash": tx_hash.hex(),
             "from": sender,
             "to": to,
-            "amount": amount,
+            "amount": float(amount),
             "chain": chain_key,
             "testnet": testnet,
             "explorer": get_explorer_url(chain_key, tx_hash.hex()),
         }
         
+    except (requests.exceptions.ConnectionError, requests.exceptions.HTTPError):
+        return {"error": f"Could not connect to {chain_key} RPC"}
     except Exception as e:
         return {"error": str(e)}
 
@@ -158,7 +127,7 @@ def get_explorer_url(chain_key: str, tx_hash: str) -> str:
 def main():
     parser = argparse.ArgumentParser(description="Send USDC")
     parser.add_argument("--to", "-t", required=True, help="Recipient address")
-    parser.add_argument("--amount", "-a", required=True, type=float, help="Amount in USDC")
+    parser.add_argument("--amount", "-a", required=True, type=_amount, help="Amount in USDC")
     parser.add_argument("--chain", "-c", default="base",
                         choices=["ethereum", "base", "polygon", "arbitrum"],
                         help="Blockchain network")
@@ -168,6 +137,8 @@ def main():
                         help="Use mainnet (DANGER!)")
     parser.add_argument("--json", "-j", action="store_true",
                         help="Output as JSON")
+    parser.add_argument("--verify-decimals", action="store_true",
+                        help="Read decimals() on-chain instead of the built-in value")
     
     args = parser.parse_args()
     
@@ -179,7 +150,8 @@ def main():
             print("Cancelled.")
             return
     
-    result = send_usdc(args.to, args.amount, args.chain, use_testnet)
+    result = send_usdc(args.to, args.amount, args.chain, use_testnet,
+                       verify_decimals=args.verify_decimals)
     
     if args.json:
         import json
@@ -0,0 +1,20 @@
+import unittest
+
+from scripts.bridge import address_to_bytes32
+
+
+class AddressToBytes32Test(unittest.TestCase):
+    def test_left_pads_address_to_32_bytes(self):
+        address = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+        result = address_to_bytes32(address)
+        self.assertEqual(len(result), 32)
+        self.assertEqual(result[:12], bytes(12))
+        self.assertEqual(result[12:], bytes.fromhex(address[2:]))
+
+    def test_keeps_leading_zero_bytes(self):
+        result = address_to_bytes32("0x0000000000000000000000000000000000000001")
+        self.assertEqual(result, bytes(31) + b"\x01")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from decimal import Decimal
+
+from scripts import _common
+from scripts._common import gas_limit, record_gas_used, to_base_units
+
+
+class ToBaseUnitsTest(unittest.TestCase):
+    def test_converts_whole_and_fractional_amounts(self):
+        self.assertEqual(to_base_units(Decimal("1.5"), 10 ** 6), 1500000)
+        self.assertEqual(to_base_units("0.000001", 10 ** 6), 1)
+        self.assertEqual(to_base_units("1e2", 10 ** 6), 100000000)
+
+    def test_rejects_amounts_that_would_truncate(self):
+        with self.assertRaises(ValueError):
+            to_base_units("0.0000001", 10 ** 6)
+
+    def test_rejects_non_positive_amounts(self):
+        for amount in ("0", "-1"):
+            with self.assertRaises(ValueError):
+                to_base_units(amount, 10 ** 6)
+
+    def test_rejects_non_numbers(self):
+        for amount in ("NaN", "Infinity", "abc"):
+            with self.assertRaises(ValueError):
+                to_base_units(amount, 10 ** 6)
+
+
+class GasBaselineTest(unittest.TestCase):
+    def setUp(self):
+        _common._GAS_BASELINE.clear()
+
+    def test_falls_back_to_static_limit(self):
+        self.assertEqual(gas_limit("base", "depositForBurn"), 300000)
+
+    def test_estimates_never_lower_the_baseline(self):
+        self.assertEqual(gas_limit("base", "depositForBurn", 200000), 240000)
+        self.assertEqual(gas_limit("base", "depositForBurn", 100000), 120000)
+        self.assertEqual(gas_limit("base", "depositForBurn"), 240000)
+
+    def test_gas_used_never_lowers_the_baseline(self):
+        record_gas_used("base", "depositForBurn", 100000)
+        self.assertEqual(gas_limit("base", "depositForBurn"), 300000)
+        record_gas_used("base", "depositForBurn", 300000)
+        self.assertEqual(gas_limit("base", "depositForBurn"), 360000)
+
+
+if __name__ == "__main__":
+    unittest.main()